@@ -0,0 +1,71 @@
+# font5x8.py (module-only: no printing, no CLI)
+# 5x8 bitmap text rendered straight into a page-packed OLED framebuffer.
+#
+# Buffer layout matches what the panel expects on the wire: one byte per
+# column per 8-row page, bit 0 = top row of the page, i.e.
+#   byte index = (y // 8) * width + x,  bit = y % 8
+from pathlib import Path
+
+FONT_W, FONT_H = 5, 8
+CHAR_W = FONT_W + 1  # 1px gap between characters
+
+
+def _load_glyphs(path: Path = Path(__file__).with_name("font5x8.bin")) -> bytes:
+    """
+    Read font5x8.bin (2-byte w/h header, then 256 glyphs of 5 column bytes).
+    """
+    data = path.read_bytes()
+    if (data[0], data[1]) != (FONT_W, FONT_H) or len(data) != 2 + 256 * FONT_W:
+        raise ValueError(f"{path} is not a {FONT_W}x{FONT_H} bitmap font")
+    return data[2:]
+
+
+_GLYPHS = _load_glyphs()
+
+
+def draw_text(buf, s, x, y, width, height):
+    """
+    OR string `s` into `buf` with its top-left corner at pixel (x, y).
+    Each glyph column is one font byte shifted into (at most) two pages,
+    so a character costs 5 byte ORs instead of 40 pixel sets.
+    Anything outside width x height is clipped.
+    """
+    pages = height // 8
+    page, shift = divmod(y, 8)
+    top = page * width
+    bottom = top + width
+    top_ok = 0 <= page < pages
+    bottom_ok = shift != 0 and 0 <= page + 1 < pages
+
+    for ch in s:
+        code = ord(ch)
+        if code < 256 and x < width:
+            g = code * FONT_W
+            for col in range(FONT_W):
+                cx = x + col
+                if 0 <= cx < width:
+                    bits = _GLYPHS[g + col] << shift
+                    if top_ok:
+                        buf[top + cx] |= bits & 0xFF
+                    if bottom_ok:
+                        buf[bottom + cx] |= bits >> 8
+        x += CHAR_W
+
+
+def clear_rows(buf, y, h, width, height):
+    """
+    Zero pixel rows y .. y+h-1 across the full width.
+    """
+    y0 = max(0, y)
+    y1 = min(height, y + h)
+    while y0 < y1:
+        page, bit = divmod(y0, 8)
+        n = min(8 - bit, y1 - y0)
+        start = page * width
+        if n == 8:
+            buf[start:start + width] = bytes(width)
+        else:
+            keep = ~(((1 << n) - 1) << bit) & 0xFF
+            for i in range(start, start + width):
+                buf[i] &= keep
+        y0 += n
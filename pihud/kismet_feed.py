@@ -5,22 +5,31 @@ kismet_feed.py
 Fetch Kismet counts (AP/Wifi/BT) and uptime.
 - get_counts() returns a dict: { 'ap': int, 'wifi': int, 'bt': int }
 - get_uptime() returns a string like "Uptime HH:MM:SS"
+  (Kismet's start time is cached, so most calls make no HTTP request)
 - Supports authentication via API token or username/password
 - Reads credentials from environment variables by default:
     KISMET_TOKEN, KISMET_USER, KISMET_PASS
 """
 
 import os
-import re
-import ssl
-import base64
-import urllib.request
 import time
+import functools
 import json
-import gps
+import select
+import socket
+import urllib3
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    _json_loads = orjson.loads  # faster, parses bytes without a decode hop
+except ImportError:
+    _json_loads = json.loads
+
+# Seconds a get_counts() result is reused before Kismet is queried again
+COUNTS_CACHE_TTL = 2
+
 # Record script start time
 script_start = time.time()
 
@@ -29,6 +38,33 @@ credfile = Path.home() / ".kismet_creds"
 if credfile.exists():
     load_dotenv(credfile)
 
+
+def _auth_headers(user=None, password=None, token=None):
+    """
+    Kismet auth headers. Priority:
+        1. Explicit token arg
+        2. KISMET_TOKEN env var
+        3. Explicit user/password
+        4. KISMET_USER/KISMET_PASS env vars
+    """
+    token = token or os.environ.get("KISMET_TOKEN")
+    if token:
+        return {"KISMET": token}
+    user = user or os.environ.get("KISMET_USER")
+    password = password or os.environ.get("KISMET_PASS")
+    if user and password:
+        return urllib3.make_headers(basic_auth=f"{user}:{password}")
+    return {}
+
+
+# One connection pool shared by every Kismet request, so successive calls
+# reuse a keep-alive socket instead of reconnecting. Env credentials are
+# baked into its default headers. retries=False so timeout=10 in _http_get
+# really bounds a call (urllib3 would otherwise retry a hung GET 3 times).
+_POOL = urllib3.PoolManager(
+    num_pools=1, maxsize=4, headers=_auth_headers(), retries=False
+)
+
 def get_script_uptime():
     """
     Returns a string HH:MM:SS since this script started.
@@ -41,108 +77,183 @@ def get_script_uptime():
 
 def _http_get(url, user=None, password=None, token=None):
     """
-    HTTP GET with optional Kismet API token or Basic auth.
-    Priority:
-        1. Explicit token arg
-        2. KISMET_TOKEN env var
-        3. Explicit user/password
-        4. KISMET_USER/KISMET_PASS env vars
+    HTTP GET with optional Kismet API token or Basic auth (see _auth_headers).
+    Returns the raw response body as bytes.
     """
-    req = urllib.request.Request(url)
+    # the pool's default headers already carry the env credentials; only
+    # explicit args need a per-request header set
+    headers = None
+    if user or password or token:
+        headers = _auth_headers(user=user, password=password, token=token)
 
-    # token wins
-    token = token or os.environ.get("KISMET_TOKEN")
-    if token:
-        req.add_header("KISMET", token)
-    else:
-        user = user or os.environ.get("KISMET_USER")
-        password = password or os.environ.get("KISMET_PASS")
-        if user and password:
-            creds = f"{user}:{password}".encode("utf-8")
-            b64 = base64.b64encode(creds).decode("ascii")
-            req.add_header("Authorization", "Basic " + b64)
-
-    ctx = ssl.create_default_context()
-    with urllib.request.urlopen(req, context=ctx, timeout=10) as fh:
-        return fh.read().decode("utf-8")
+    resp = _POOL.request("GET", url, headers=headers, timeout=10)
+    if resp.status >= 400:
+        raise urllib3.exceptions.HTTPError(f"HTTP {resp.status} from {url}")
+    # raw bytes: json.loads takes them directly, no separate decode pass
+    return resp.data
 
 
 def parse_all_views_sizes(all_views_json_text):
     """
     Extract sizes from Kismet /devices/views/all_views.json without jq.
+    Accepts the response body as bytes or str.
     Returns dict: {'ap': int, 'wifi': int, 'bt': int}
     """
-    def find_size(viewid):
-        pat = f'"kismet.devices.view.id": "{viewid}"'
-        idx = all_views_json_text.find(pat)
-        if idx == -1:
-            return 0
-        sub = all_views_json_text[idx: idx + 200]
-        m = re.search(r'"kismet.devices.view.size"\s*:\s*([0-9]+)', sub)
-        if m:
-            return int(m.group(1))
-        return 0
-
+    sizes = {
+        v.get("kismet.devices.view.id"): v.get("kismet.devices.view.size", 0)
+        for v in _json_loads(all_views_json_text)
+    }
     return {
-        "ap": find_size("phydot11_accesspoints"),
-        "wifi": find_size("phy-IEEE802.11"),
-        "bt": find_size("phy-Bluetooth"),
+        "ap": sizes.get("phydot11_accesspoints", 0),
+        "wifi": sizes.get("phy-IEEE802.11", 0),
+        "bt": sizes.get("phy-Bluetooth", 0),
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _get_counts_cached(url, user, password, token, _bucket):
+    txt = _http_get(url, user=user, password=password, token=token)
+    return parse_all_views_sizes(txt)
+
+
 def get_counts(host="localhost", port=2501, user=None, password=None, token=None):
     """
     Query Kismet for AP/WiFi/BT counts.
+    Calls within the same COUNTS_CACHE_TTL window share one request.
     """
     base = f"http://{host}:{port}"
     url = f"{base}/devices/views/all_views.json"
-    txt = _http_get(url, user=user, password=password, token=token)
-    return parse_all_views_sizes(txt)
+    bucket = int(time.time()) // COUNTS_CACHE_TTL
+    return dict(_get_counts_cached(url, user, password, token, bucket))
+
+
+# gpsd JSON socket kept open across calls, plus the last fix mode seen on it
+GPSD_ADDR = ("127.0.0.1", 2947)
+GPS_READ_BUDGET = 0.25  # max seconds one get_gps_status() spends reading
+GPS_POLL_WAIT = 0.05    # how long to wait for more data before giving up
+_GPS_SOCK = None
+_GPS_BUF = b""
+_LAST_MODE = 1
+
+
+def _gps_connect():
+    sock = socket.create_connection(GPSD_ADDR, timeout=2)
+    sock.sendall(b'?WATCH={"enable":true,"json":true}\n')
+    sock.setblocking(False)
+    return sock
+
+
+def _read_tpv():
+    """
+    Read what gpsd has sent, for at most GPS_READ_BUDGET seconds (stopping
+    early once the socket is quiet for GPS_POLL_WAIT), and update
+    _LAST_MODE from the newest TPV line; other report classes are skipped
+    without being parsed.
+    """
+    global _GPS_BUF, _LAST_MODE
+    # bounded: a chatty gpsd can't hold the caller past GPS_READ_BUDGET
+    deadline = time.monotonic() + GPS_READ_BUDGET
+    while (time.monotonic() < deadline
+           and select.select([_GPS_SOCK], [], [], GPS_POLL_WAIT)[0]):
+        chunk = _GPS_SOCK.recv(4096)
+        if not chunk:
+            raise ConnectionError("gpsd closed the connection")
+        _GPS_BUF += chunk
+
+    *lines, _GPS_BUF = _GPS_BUF.split(b"\n")
+    for line in reversed(lines):
+        if b'"class":"TPV"' in line:
+            _LAST_MODE = _json_loads(line).get("mode", 1)
+            break
 
 
 def get_gps_status():
     """
-    Connects to gpsd and returns 'NO', '2D', or '3D' depending on fix mode.
-    Requires gpsd to be running (e.g., gpsd /dev/ttyACM0).
+    Returns 'NO-FIX', '2D', or '3D' depending on fix mode, or 'NO' if gpsd
+    is unreachable. Requires gpsd to be running (e.g., gpsd /dev/ttyACM0).
+
+    Talks to gpsd's JSON protocol over one long-lived socket; each call
+    answers from the most recent TPV report received so far.
     """
+    global _GPS_SOCK, _GPS_BUF, _LAST_MODE
     try:
-        session = gps.gps(mode=gps.WATCH_ENABLE)
-        report = session.next()
-        # Loop until we find a TPV report (contains fix data)
-        while report['class'] != 'TPV':
-            report = session.next()
-
-        mode = getattr(report, 'mode', 1)
-        if mode == 3:
-            return "3D"
-        elif mode == 2:
-            return "2D"
-        else:
-            return "NO-FIX"
-    except Exception as e:
-        return f"NO"  # default to NO fix if gpsd unavailable
+        if _GPS_SOCK is None:
+            _GPS_SOCK = _gps_connect()
+        _read_tpv()
+    except Exception:
+        # drop the socket so the next call reconnects
+        if _GPS_SOCK is not None:
+            _GPS_SOCK.close()
+        _GPS_SOCK = None
+        _GPS_BUF = b""
+        _LAST_MODE = 1
+        return "NO"  # default to NO fix if gpsd unavailable
 
+    if _LAST_MODE == 3:
+        return "3D"
+    elif _LAST_MODE == 2:
+        return "2D"
+    else:
+        return "NO-FIX"
 
-def get_uptime(host="localhost", port=2501, user=None, password=None, token=None):
+
+# Kismet server start time per base URL: base -> (start_ts, fetched_at).
+# Uptime is computed locally from it; /status.json is only re-read every
+# KISMET_START_REFRESH_SEC (or until a fetch has succeeded).
+KISMET_START_REFRESH_SEC = 600
+_KISMET_START = {}
+
+
+def _kismet_start(host="localhost", port=2501, user=None, password=None, token=None):
     """
-    Returns a string HH:MM:SS of how long Kismet has been running.
+    Returns kismet.server.starttime (epoch seconds) or None if unknown.
+    A failed refresh keeps the previously fetched value. Transport errors
+    propagate only when nothing is cached yet; unparseable bodies never do.
     """
     base = f"http://{host}:{port}"
-    url = f"{base}/status.json"
-    txt = _http_get(url, user=user, password=password, token=token)
+    cached = _KISMET_START.get(base)
+    if cached and time.monotonic() - cached[1] < KISMET_START_REFRESH_SEC:
+        return cached[0]
+
+    try:
+        txt = _http_get(f"{base}/status.json", user=user, password=password, token=token)
+    except Exception:
+        if cached is None:
+            raise
+        return cached[0]
+
     try:
-        js = json.loads(txt)
-        start_ts = js.get("kismet.server.starttime", None)
-        if start_ts is None:
-            return "Uptime: ?"
-
-        elapsed = int(time.time() - start_ts)
-        hh = elapsed // 3600
-        mm = (elapsed % 3600) // 60
-        ss = elapsed % 60
-        return f"Uptime {hh:02}:{mm:02}:{ss:02}"
+        start_ts = _json_loads(txt).get("kismet.server.starttime", None)
     except Exception:
+        start_ts = None  # not JSON, or not an object
+
+    if start_ts is None:
+        return cached[0] if cached else None
+    _KISMET_START[base] = (start_ts, time.monotonic())
+    return start_ts
+
+
+def uptime_string_local(host="localhost", port=2501):
+    """
+    Kismet uptime from the cached start time only (no HTTP).
+    """
+    cached = _KISMET_START.get(f"http://{host}:{port}")
+    if cached is None:
+        return "Uptime: ?"
+    elapsed = int(time.time() - cached[0])
+    hh = elapsed // 3600
+    mm = (elapsed % 3600) // 60
+    ss = elapsed % 60
+    return f"Uptime {hh:02}:{mm:02}:{ss:02}"
+
+
+def get_uptime(host="localhost", port=2501, user=None, password=None, token=None):
+    """
+    Returns a string HH:MM:SS of how long Kismet has been running.
+    """
+    if _kismet_start(host, port, user=user, password=password, token=token) is None:
         return "Uptime: ?"
+    return uptime_string_local(host, port)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,57 @@
 # list_ips.py (module-only: no printing, no CLI)
 from __future__ import annotations
 
+import fcntl
+import functools
 import json
 import shutil
 import socket
+import struct
 import subprocess
+import time
 from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+try:
+    from pyroute2 import IPRoute
+except ImportError:  # optional: fall back to the `ip` command
+    IPRoute = None
+
+# How long (seconds) a fetched address table is reused before re-reading it
+ROWS_TTL_SEC = 5.0
+# How long (seconds) a filtered per-interface result is reused
+ADDRESS_TTL_SEC = 30.0
+
+# <linux/sockios.h> ioctls for the IPv4 fast path
+SIOCGIFADDR = 0x8915
+SIOCGIFNETMASK = 0x891B
+
+# rtnetlink scope numbers -> the names `ip` prints
+_RT_SCOPES = {0: "global", 200: "site", 253: "link", 254: "host", 255: "nowhere"}
+
+
+def _ttl_cache(ttl: float):
+    """
+    Memoize a function for `ttl` seconds, keyed by its call arguments.
+    """
+    def deco(fn):
+        stored: Dict[tuple, Tuple[float, object]] = {}
+
+        @functools.wraps(fn)
+        def wrap(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = stored.get(key)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            value = fn(*args, **kwargs)
+            stored[key] = (now, value)
+            return value
+
+        return wrap
+    return deco
+
 
 def _have_ip_cmd() -> bool:
     return shutil.which("ip") is not None
@@ -47,6 +90,64 @@ def _get_ips_via_ip_json() -> List[Tuple[str, str, str, str, str]]:
     return rows
 
 
+def _get_ips_via_netlink() -> List[Tuple[str, str, str, str, str]]:
+    """
+    Returns list of tuples: (ifname, family, cidr, scope, operstate)
+    straight from rtnetlink via pyroute2 (no subprocess).
+    """
+    rows: List[Tuple[str, str, str, str, str]] = []
+    with IPRoute() as ipr:
+        links = {}
+        for link in ipr.get_links():
+            ifname = link.get_attr("IFLA_IFNAME") or "?"
+            oper = link.get_attr("IFLA_OPERSTATE") or _read_operstate(ifname)
+            links[link["index"]] = (ifname, oper)
+        for a in ipr.get_addr():
+            if a["family"] == socket.AF_INET:
+                family = "inet"
+            elif a["family"] == socket.AF_INET6:
+                family = "inet6"
+            else:
+                continue
+            local = a.get_attr("IFA_LOCAL") or a.get_attr("IFA_ADDRESS")
+            if not local:
+                continue
+            ifname, oper = links.get(a["index"], ("?", "unknown"))
+            scope = _RT_SCOPES.get(a["scope"], str(a["scope"]))
+            rows.append((ifname, family, f"{local}/{a['prefixlen']}", scope, oper))
+    return rows
+
+
+def _get_ipv4_via_ioctl() -> List[Tuple[str, str, str, str, str]]:
+    """
+    IPv4-only: primary address + netmask of each interface via
+    SIOCGIFADDR / SIOCGIFNETMASK ioctls (no subprocess, no netlink lib).
+    Returns list of tuples: (ifname, family, cidr, scope, operstate)
+    """
+    rows: List[Tuple[str, str, str, str, str]] = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        for _, ifname in socket.if_nameindex():
+            req = struct.pack("256s", ifname.encode()[:15])
+            try:
+                addr = fcntl.ioctl(s.fileno(), SIOCGIFADDR, req)[20:24]
+            except OSError:
+                continue  # no IPv4 address on this interface
+            try:
+                mask = fcntl.ioctl(s.fileno(), SIOCGIFNETMASK, req)[20:24]
+                prefix = bin(int.from_bytes(mask, "big")).count("1")
+            except OSError:
+                prefix = 32
+            if addr[0] == 127:
+                scope = "host"
+            elif addr[:2] == b"\xa9\xfe":  # 169.254/16
+                scope = "link"
+            else:
+                scope = "global"
+            cidr = f"{socket.inet_ntoa(addr)}/{prefix}"
+            rows.append((ifname, "inet", cidr, scope, _read_operstate(ifname)))
+    return rows
+
+
 def _get_ips_via_ip_oneline() -> List[Tuple[str, str, str, str, str]]:
     """
     Fallback: parse `ip -o addr show`.
@@ -86,6 +187,39 @@ def _last_resort_primary() -> List[Tuple[str, str, str, str, str]]:
         return []
 
 
+@_ttl_cache(ROWS_TTL_SEC)
+def _get_rows(v4_only: bool = False) -> List[Tuple[str, str, str, str, str]]:
+    """
+    Address table from the cheapest working source, reused for ROWS_TTL_SEC.
+    Order: rtnetlink -> (v4_only) ioctl -> `ip -j` -> `ip -o` -> UDP-socket guess.
+    """
+    rows: List[Tuple[str, str, str, str, str]] = []
+    if IPRoute is not None:
+        try:
+            rows = _get_ips_via_netlink()
+        except Exception:
+            rows = []
+    if not rows and v4_only:
+        try:
+            rows = _get_ipv4_via_ioctl()
+        except Exception:
+            rows = []
+    if not rows:
+        if _have_ip_cmd():
+            try:
+                rows = _get_ips_via_ip_json()
+            except Exception:
+                try:
+                    rows = _get_ips_via_ip_oneline()
+                except Exception:
+                    rows = _last_resort_primary()
+        else:
+            rows = _last_resort_primary()
+
+    return rows
+
+
+@_ttl_cache(ADDRESS_TTL_SEC)
 def _collect_addresses(
     include_loopback: bool = False,
     only_up: bool = False,
@@ -99,17 +233,7 @@ def _collect_addresses(
       ...
     }
     """
-    rows: List[Tuple[str, str, str, str, str]] = []
-    if _have_ip_cmd():
-        try:
-            rows = _get_ips_via_ip_json()
-        except Exception:
-            try:
-                rows = _get_ips_via_ip_oneline()
-            except Exception:
-                rows = _last_resort_primary()
-    else:
-        rows = _last_resort_primary()
+    rows = _get_rows(v4_only=want_v4 and not want_v6)
 
     addrs = defaultdict(lambda: {"ipv4": [], "ipv6": []})
     for ifname, family, cidr, scope, oper in rows:
@@ -155,12 +279,14 @@ def get_local_ips(
     """
     Dict of interface -> {'ipv4': [...], 'ipv6': [...]}, with CIDR suffixes.
     """
-    return _collect_addresses(
+    data = _collect_addresses(
         include_loopback=include_loopback,
         only_up=only_up,
         want_v4=ipv4,
         want_v6=ipv6,
     )
+    # copy so callers can't mutate the cached result
+    return {k: {fam: list(v) for fam, v in fams.items()} for k, fams in data.items()}
 
 
 def get_ip_strings(
@@ -172,13 +298,18 @@ def get_ip_strings(
     """
     Flat list of IP strings (CIDR removed), e.g. ['192.168.1.10', 'fe80::1'].
     """
-    data = get_local_ips(
+    data = _collect_addresses(
         include_loopback=include_loopback,
         only_up=only_up,
-        ipv4=ipv4,
-        ipv6=ipv6,
+        want_v4=ipv4,
+        want_v6=ipv6,
     )
-    return [a.split("/", 1)[0] for fams in data.values() for a in (fams["ipv4"] + fams["ipv6"])]
+    return [
+        a.partition("/")[0]
+        for fams in data.values()
+        for fam in ("ipv4", "ipv6")
+        for a in fams[fam]
+    ]
 
 
 def get_primary_ipv4() -> str | None:
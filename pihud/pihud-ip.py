@@ -1,8 +1,10 @@
 # pihud.py — CH1115 88x48 (landscape) @ 0x3C
 # Shows multiple lines simultaneously and toggles every 5s between centered and right-aligned.
-import time, board, busio
-import adafruit_ssd1306
-from smbus2 import SMBus
+import atexit, time
+from functools import lru_cache
+from smbus2 import SMBus, i2c_msg
+
+from font5x8 import CHAR_W, draw_text, clear_rows
 
 # ----- Hardware config -----
 ADDR = 0x3C
@@ -27,20 +29,47 @@ else:
 
 START_LINE = 0
 
+# ----- I2C bus (opened once, closed at exit) -----
+_BUS = SMBus(1)
+atexit.register(_BUS.close)
+
 # ----- Low-level I2C helpers -----
-def _cmd(b, *v): b.write_i2c_block_data(ADDR, 0x00, list(v))
-def _data(b, ch):
+def _cmd(b, *v): b.write_i2c_block_data(ADDR, 0x00, v)
+_LONG_WRITES = True                    # cleared once the adapter rejects i2c_rdwr
+def _data(b, ch, page):
+    global _LONG_WRITES
+    if _LONG_WRITES:
+        try:
+            # whole page (88 bytes) in a single I2C transaction
+            b.i2c_rdwr(i2c_msg.write(ADDR, b"\x40" + bytes(ch)))
+            return
+        except OSError:
+            # adapter refused the long write; stop trying it. Part of it may
+            # have landed and moved the column pointer, so re-address first.
+            _LONG_WRITES = False
+            _set_page_col(b, page)
+    # SMBus block max is 32 bytes
     i = 0
     while i < len(ch):
-        n = min(16, len(ch) - i)
-        b.write_i2c_block_data(ADDR, 0x40, list(ch[i:i+n]))
+        n = min(32, len(ch) - i)
+        b.write_i2c_block_data(ADDR, 0x40, ch[i:i+n])
         i += n
-def _set_page_col(b, page, col):
-    _cmd(b, 0xB0 | (page & 0x0F))         # select PAGE (8-row strip)
-    _cmd(b, 0x00 | (col & 0x0F))          # column low nibble
-    _cmd(b, 0x10 | ((col >> 4) & 0x0F))   # column high nibble
+# Page-select + column-address commands for each page at X_OFFSET, built once
+_PAGE_CMDS = [
+    bytes([
+        0xB0 | (page & 0x0F),              # select PAGE (8-row strip)
+        0x00 | (X_OFFSET & 0x0F),          # column low nibble
+        0x10 | ((X_OFFSET >> 4) & 0x0F),   # column high nibble
+    ])
+    for page in range(8)
+]
+def _set_page_col(b, page):
+    # all three commands in one transaction
+    b.write_i2c_block_data(ADDR, 0x00, _PAGE_CMDS[page])
 
 # ----- Display init / clear -----
+_CLEAR_PAGE = bytes(W)                     # one blank page, reused by every clear
+
 def _init_for_48_rows(b):
     # Program 48-row glass and orientation
     _cmd(b, 0xAE)                          # display OFF
@@ -49,35 +78,78 @@ def _init_for_48_rows(b):
     _cmd(b, 0x40)                          # start line = 0
     _cmd(b, SEG)                           # segment remap (X mirror)
     _cmd(b, COM)                           # COM scan dir (Y flip)
+    # Power-up settings (previously sent by adafruit_ssd1306 at import)
+    _cmd(b, 0xD5, 0x80)                    # clock divide / oscillator
+    _cmd(b, 0xDA, 0x12)                    # COM pins: alternative config
+    _cmd(b, 0xD9, 0xF1)                    # precharge period
+    _cmd(b, 0xDB, 0x30)                    # VCOMH deselect level
+    _cmd(b, 0x81, 0xFF)                    # contrast = max
+    _cmd(b, 0xA4)                          # display follows RAM
+    _cmd(b, 0xA6)                          # normal (not inverted)
+    _cmd(b, 0x8D, 0x14)                    # charge pump ON
     _cmd(b, 0xAF)                          # display ON
 
 def _clear_all_pages(b):
     # Wipe up to 64 rows to avoid ghosting
     for p in range(8):
-        _set_page_col(b, p, X_OFFSET)
-        _data(b, bytes([0x00]) * W)
+        _set_page_col(b, p)
+        _data(b, _CLEAR_PAGE, p)
+    _LAST_PAGES[:] = [None] * PAGES        # force a full push on next frame
 
 def init_panel():
-    with SMBus(1) as b:
-        _init_for_48_rows(b)
-        _clear_all_pages(b)
+    _init_for_48_rows(_BUS)
+    _clear_all_pages(_BUS)
 
 # ----- Push ONLY the current framebuffer (no re-init; ideal for redraws) -----
-def push_frame_only(buf):
-    with SMBus(1) as b:
-        for p in range(PAGES):             # PAGES = 48/8 = 6
-            _set_page_col(b, p, X_OFFSET)
-            start = p * W                  # byte index of this page in the buffer
-            _data(b, buf[start:start + W])
-
-# ----- Drawing helpers (use Adafruit SSD1306 framebuffer) -----
-i2c = busio.I2C(board.SCL, board.SDA)
-d = adafruit_ssd1306.SSD1306_I2C(W, H, i2c, addr=ADDR)
+_LAST_PAGES = [None] * PAGES               # bytes last sent per page
 
-def text_width(s, char_w=6):
+def push_frame_only(buf):
+    for p in range(PAGES):                 # PAGES = 48/8 = 6
+        start = p * W                      # byte index of this page in the buffer
+        page = bytes(buf[start:start + W])
+        if page == _LAST_PAGES[p]:         # unchanged since last push: skip I2C
+            continue
+        _set_page_col(_BUS, p)
+        _data(_BUS, page, p)
+        _LAST_PAGES[p] = page
+
+# ----- Drawing helpers (page-packed framebuffer, same layout as the panel) -----
+_FB = bytearray(PAGES * W)
+
+def text_width(s, char_w=CHAR_W):
     # Built-in 5x8 font ~5px wide + 1px spacing
     return len(s) * char_w
 
+@lru_cache(maxsize=8)
+def _layout(lines, aligns, line_spacing, y_start, font_h=8):
+    """
+    (text, x, y) per line, or None if the line falls off-screen.
+    Cached: the same lines/aligns (e.g. the two flip states) reuse coords.
+    """
+    n = len(lines)
+    total_h = n*font_h + (n-1)*line_spacing
+    if y_start is None:
+        y0 = max(0, (H - total_h)//2)  # vertical centering
+    else:
+        y0 = y_start
+
+    placed = []
+    for s, a in zip(lines, aligns):
+        if a == "right":
+            x = W - text_width(s)
+        elif a == "left":
+            x = 2
+        else:  # center
+            x = max(0, (W - text_width(s)) // 2)
+        y = y0 + len(placed)*(font_h + line_spacing)
+        if 0 <= y <= H - font_h:       # stay in-bounds (no wrapping)
+            placed.append((s, x, y))
+        else:
+            placed.append(None)
+    return tuple(placed)
+
+_LAST_DRAWN = []                       # what show_lines_align put in _FB last time
+
 def show_lines_align(lines, align="center", line_spacing=12, y_start=None):
     """
     Draw multiple lines, then push once (no flicker).
@@ -92,34 +164,31 @@ def show_lines_align(lines, align="center", line_spacing=12, y_start=None):
     """
     # Normalize align(s)
     if isinstance(align, (list, tuple)):
-        aligns = list(align)
+        aligns = tuple(align)
         if len(aligns) != len(lines):
             raise ValueError("When align is a list/tuple, its length must match lines")
     else:
-        aligns = [align] * len(lines)
+        aligns = (align,) * len(lines)
 
-    d.fill(0)
     n = len(lines)
     font_h = 8
-    total_h = n*font_h + (n-1)*line_spacing
-    if y_start is None:
-        y0 = max(0, (H - total_h)//2)  # vertical centering
-    else:
-        y0 = y_start
-
-    for i, s in enumerate(lines):
-        a = aligns[i]
-        if a == "right":
-            x = W - text_width(s)
-        elif a == "left":
-            x = 2
-        else:  # center
-            x = max(0, (W - text_width(s)) // 2)
-        y = y0 + i*(font_h + line_spacing)
-        if 0 <= y <= H - font_h:       # stay in-bounds (no wrapping)
-            d.text(s, x, y, 1)
-
-    push_frame_only(d.buffer)
+    placed = _layout(tuple(lines), aligns, line_spacing, y_start)
+
+    # Same rows as last frame: only re-raster lines whose text/x changed.
+    # Otherwise the layout moved, so start from a blank buffer.
+    rows = [p[2] if p else None for p in placed]
+    if rows != [p[2] if p else None for p in _LAST_DRAWN]:
+        _FB[:] = bytes(len(_FB))
+        _LAST_DRAWN[:] = [None] * n
+    for i, p in enumerate(placed):
+        if p is None or p == _LAST_DRAWN[i]:
+            continue
+        s, x, y = p
+        clear_rows(_FB, y, font_h, W, H)
+        draw_text(_FB, s, x, y, W, H)
+    _LAST_DRAWN[:] = placed
+
+    push_frame_only(_FB)
 
 # ---- your data sources ----
 from list_ips import get_hostname, get_ip_strings
@@ -151,5 +220,4 @@ if __name__ == "__main__":
 
             flip = not flip
     except KeyboardInterrupt:
-        with SMBus(1) as b:
-            _clear_all_pages(b)
+        _clear_all_pages(_BUS)
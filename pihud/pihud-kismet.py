@@ -7,11 +7,12 @@ All lines left-aligned.
 """
 
 import time
-import board
-import busio
-from smbus2 import SMBus
-import adafruit_ssd1306
+import atexit
+import threading
+from functools import lru_cache
+from smbus2 import SMBus, i2c_msg
 
+from font5x8 import CHAR_W, draw_text, clear_rows
 from kismet_feed import get_counts, get_gps_status
 
 
@@ -25,23 +26,48 @@ COM = 0xC0
 X_OFFSET = 0
 START_LINE = 0
 
+# Bus handle opened once for the life of the process
+_BUS = SMBus(1)
+atexit.register(_BUS.close)
+
 # ----- Low-level I2C helpers -----
 def _cmd(b, *v):
-    b.write_i2c_block_data(ADDR, 0x00, list(v))
-
-def _data(b, ch):
+    b.write_i2c_block_data(ADDR, 0x00, v)
+
+# Cleared the first time the adapter rejects a long i2c_rdwr write, so
+# later pages go straight to SMBus-sized blocks
+_LONG_WRITES = True
+
+def _data(b, ch, page):
+    # Whole chunk in one I2C transaction; fall back to SMBus-sized blocks
+    # on adapters that reject long writes
+    global _LONG_WRITES
+    if _LONG_WRITES:
+        try:
+            b.i2c_rdwr(i2c_msg.write(ADDR, b"\x40" + bytes(ch)))
+            return
+        except OSError:
+            # a partial write may have advanced the column pointer
+            _LONG_WRITES = False
+            _set_page_col(b, page)
     i = 0
     while i < len(ch):
-        n = min(16, len(ch) - i)
-        b.write_i2c_block_data(ADDR, 0x40, list(ch[i:i+n]))
+        n = min(32, len(ch) - i)
+        b.write_i2c_block_data(ADDR, 0x40, ch[i:i+n])
         i += n
 
-def _set_page_col(b, page, col):
-    _cmd(b, 0xB0 | (page & 0x0F))
-    _cmd(b, 0x00 | (col & 0x0F))
-    _cmd(b, 0x10 | ((col >> 4) & 0x0F))
+# Page + column address commands per page (column fixed at X_OFFSET)
+_PAGE_CMDS = [
+    bytes([0xB0 | (page & 0x0F), 0x00 | (X_OFFSET & 0x0F), 0x10 | ((X_OFFSET >> 4) & 0x0F)])
+    for page in range(8)
+]
+
+def _set_page_col(b, page):
+    b.write_i2c_block_data(ADDR, 0x00, _PAGE_CMDS[page])
 
 # ----- Display init / clear -----
+_CLEAR_PAGE = bytes(W)
+
 def _init_for_48_rows(b):
     _cmd(b, 0xAE)
     _cmd(b, 0xA8, (H - 1) & 0x3F)
@@ -49,55 +75,117 @@ def _init_for_48_rows(b):
     _cmd(b, 0x40)
     _cmd(b, SEG)
     _cmd(b, COM)
+    # power-up settings adafruit_ssd1306 used to send at import
+    _cmd(b, 0xD5, 0x80)
+    _cmd(b, 0xDA, 0x12)
+    _cmd(b, 0xD9, 0xF1)
+    _cmd(b, 0xDB, 0x30)
+    _cmd(b, 0x81, 0xFF)
+    _cmd(b, 0xA4)
+    _cmd(b, 0xA6)
+    _cmd(b, 0x8D, 0x14)
     _cmd(b, 0xAF)
 
 def _clear_all_pages(b):
     for p in range(8):
-        _set_page_col(b, p, X_OFFSET)
-        _data(b, bytes([0x00]) * W)
+        _set_page_col(b, p)
+        _data(b, _CLEAR_PAGE, p)
+    # panel contents changed behind the page cache; resend everything next
+    _LAST_PAGES[:] = [None] * PAGES
 
 def init_panel():
-    with SMBus(1) as b:
-        _init_for_48_rows(b)
-        _clear_all_pages(b)
+    _init_for_48_rows(_BUS)
+    _clear_all_pages(_BUS)
+
+# Bytes last sent for each page, so unchanged pages can be skipped
+_LAST_PAGES = [None] * PAGES
 
 def push_frame_only(buf):
-    with SMBus(1) as b:
-        for p in range(PAGES):
-            _set_page_col(b, p, X_OFFSET)
-            start = p * W
-            _data(b, buf[start:start + W])
+    for p in range(PAGES):
+        start = p * W
+        page = bytes(buf[start:start + W])
+        if page == _LAST_PAGES[p]:
+            continue
+        _set_page_col(_BUS, p)
+        _data(_BUS, page, p)
+        _LAST_PAGES[p] = page
 
 # ----- Drawing helpers -----
-i2c = busio.I2C(board.SCL, board.SDA)
-d = adafruit_ssd1306.SSD1306_I2C(W, H, i2c, addr=ADDR)
+# Page-packed framebuffer, byte-for-byte what push_frame_only sends
+_FB = bytearray(PAGES * W)
 
-def text_width(s, char_w=6):
+def text_width(s, char_w=CHAR_W):
     return len(s) * char_w
 
-def show_lines_align(lines, align="left", line_spacing=12, y_start=None):
-    # Force all lines left-aligned
-    d.fill(0)
-    n = len(lines)
-    font_h = 8
+@lru_cache(maxsize=8)
+def _line_origins(n, line_spacing, y_start, font_h=8):
+    # (x, y) for each of n left-aligned lines, or None if off-screen.
+    # Depends only on the layout, not the text, so it is computed once.
     total_h = n * font_h + (n - 1) * line_spacing
 #    y0 = (H - total_h)//2 if y_start is None else y_start
     y0 = 2 if y_start is None else y_start  # small top padding to show first line
 
-    for i, s in enumerate(lines):
+    origins = []
+    for i in range(n):
         x = 2  # always left
         y = y0 + i * (font_h + line_spacing)
-        if 0 <= y <= H - font_h:
-            d.text(s, x, y, 1)
+        origins.append((x, y) if 0 <= y <= H - font_h else None)
+    return tuple(origins)
 
-    push_frame_only(d.buffer)
+# (text, x, y) per line as last drawn into _FB
+_LAST_DRAWN = []
+
+def show_lines_align(lines, align="left", line_spacing=12, y_start=None):
+    # Force all lines left-aligned
+    n = len(lines)
+    font_h = 8
+    placed = [
+        (s, *xy) if xy else None
+        for s, xy in zip(lines, _line_origins(n, line_spacing, y_start))
+    ]
+
+    # Re-raster only the lines whose text changed; a different layout
+    # (line count or rows) falls back to a full redraw
+    rows = [p[2] if p else None for p in placed]
+    if rows != [p[2] if p else None for p in _LAST_DRAWN]:
+        _FB[:] = bytes(len(_FB))
+        _LAST_DRAWN[:] = [None] * n
+    for i, p in enumerate(placed):
+        if p is None or p == _LAST_DRAWN[i]:
+            continue
+        s, x, y = p
+        clear_rows(_FB, y, font_h, W, H)
+        draw_text(_FB, s, x, y, W, H)
+    _LAST_DRAWN[:] = placed
+
+    push_frame_only(_FB)
+
+# ----- Background refresh -----
+REFRESH_SEC = 5             # how often Kismet/gpsd are polled
+RENDER_SEC = 1              # how often the screen is redrawn
+STALE_SEC = 3 * REFRESH_SEC # counts older than this are shown as "?"
+
+# Last-known values, written only by the refresher thread; the render loop
+# just reads them and never waits on Kismet or gpsd.
+_STATE = {"counts": None, "counts_at": 0.0, "gps": "NO"}
+
+def _refresher():
+    while True:
+        try:
+            _STATE["counts"] = get_counts()
+            _STATE["counts_at"] = time.monotonic()
+        except Exception:
+            pass  # keep the last good counts until they go stale
+        _STATE["gps"] = get_gps_status()
+        time.sleep(REFRESH_SEC)
 
 # ----- Main loop -----
 if __name__ == "__main__":
     init_panel()
-    INTERVAL_SEC = 5
     script_start = time.time()
 
+    threading.Thread(target=_refresher, daemon=True).start()
+
     try:
         while True:
             # Calculate script uptime
@@ -107,22 +195,22 @@ if __name__ == "__main__":
             ss = elapsed % 60
             uptime_line = f"Up {hh:02}:{mm:02}:{ss:02}"
 
-            # Get Kismet counts
-            counts = get_counts()
-            gps_status = get_gps_status()
+            # Kismet down (or poll hung): show "?" rather than frozen numbers
+            counts = _STATE["counts"]
+            if counts is None or time.monotonic() - _STATE["counts_at"] > STALE_SEC:
+                counts = {"ap": "?", "wifi": "?", "bt": "?"}
             lines = [
                 uptime_line,
                 f"AP: {counts['ap']}",
                 f"Wifi: {counts['wifi']}",
                 f"BT: {counts['bt']}",
-                f"GPS: {gps_status}",
+                f"GPS: {_STATE['gps']}",
             ]
 
             # Show all lines left-aligned
             show_lines_align(lines, align="left", line_spacing=0, y_start=8)
 
-            time.sleep(INTERVAL_SEC)
+            time.sleep(RENDER_SEC)
 
     except KeyboardInterrupt:
-        with SMBus(1) as b:
-            _clear_all_pages(b)
+        _clear_all_pages(_BUS)
@@ -33,7 +33,7 @@ python3 -m venv --system-site-packages "${INSTALL_DIR}/env"
 "${INSTALL_DIR}/env/bin/python" -m pip install --upgrade pip setuptools wheel
 
 # install required Python packages into venv
-"${INSTALL_DIR}/env/bin/python" -m pip install adafruit-circuitpython-ssd1306 smbus2 python-dotenv
+"${INSTALL_DIR}/env/bin/python" -m pip install smbus2 python-dotenv urllib3 pyroute2
 
 # create service manually
 #bash create-pihudservice.sh